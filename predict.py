@@ -1,19 +1,152 @@
 import os
+import re
 import subprocess
-import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Iterator
 from cog import BasePredictor, Input, Path as CogPath
 
+# Methods handled by piping tar into an external codec (method -> file extension)
+TAR_CODECS = {"zstd": "zst", "lz4": "lz4"}
+
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Page cache hints are Linux/POSIX only
+HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+# Maximum readahead issued per input file before compression starts
+READAHEAD_WINDOW = 64 * 1024 * 1024
+
+LEVEL_NAMES = {
+    0: "Store (no compression)",
+    1: "Fastest",
+    3: "Fast",
+    5: "Normal",
+    7: "Maximum",
+    9: "Ultra"
+}
+
+# ZIP uses different method syntax than 7z's -m0=
+ZIP_METHOD_ARGS = {
+    "LZMA": ("-mm=LZMA",),
+    "LZMA2": ("-mm=LZMA",),  # ZIP doesn't support LZMA2, use LZMA
+    "PPMd": ("-mm=PPMd",),
+    "BZip2": ("-mm=BZip2",),
+    "Deflate": ("-mm=Deflate",),
+    "Copy": ("-mm=Copy",),
+}
+
+VERBOSE_OUTPUT_ARGS = (
+    "-bsp1",  # Show progress
+    "-bt",    # Show execution time
+)
+
+QUIET_OUTPUT_ARGS = (
+    "-bso0",  # Disable standard output messages
+    "-bsp0",  # Disable progress output
+)
+
+
+def _format_size(size_bytes: int) -> str:
+    """Format bytes into human-readable size"""
+    unit_idx = min(max(0, (abs(size_bytes).bit_length() - 1) // 10), len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit_idx)):.2f} {SIZE_UNITS[unit_idx]}"
+
+
+def _get_level_name(level: int) -> str:
+    """Get compression level name"""
+    return LEVEL_NAMES.get(level, f"Level {level}")
+
+
+def _read_memory_limit() -> int:
+    """Get usable memory in bytes: physical RAM capped by the cgroup limit (0 if unknown)"""
+    try:
+        limit = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError):
+        limit = 0
+    # cgroup v2, then v1 (which reports a huge number when unlimited)
+    for cgroup_file in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            value = Path(cgroup_file).read_text().strip()
+        except OSError:
+            continue
+        if value.isdigit():
+            limit = min(limit, int(value)) if limit else int(value)
+        break
+    return limit
+
+
+def _lzma_default_dict(level: int) -> int:
+    """Get the dictionary size 7z's LZMA encoder picks for a compression level"""
+    if level <= 5:
+        return 1 << (level * 2 + 14)
+    return 1 << 25 if level == 6 else 1 << 26
+
+
+def _stat_size(path: Path, readahead: int = 0) -> int:
+    """Get the size of an input file, verifying it exists and starting readahead on its head"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        raise RuntimeError(f"Input file does not exist: {path}")
+    try:
+        size = os.fstat(fd).st_size
+        if readahead and HAS_FADVISE:
+            try:
+                os.posix_fadvise(fd, 0, min(size, readahead), os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+        return size
+    finally:
+        os.close(fd)
+
+
+def _drop_cache(paths: list[str]) -> None:
+    """Release cached pages of files that will not be read again"""
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
 class Predictor(BasePredictor):
     def setup(self):
         """Setup runs once when the container starts"""
         # Verify p7zip is installed
         try:
-            subprocess.run(["7z"], capture_output=True)
+            result = subprocess.run(["7z", "i"], capture_output=True, text=True)
             print("✓ p7zip (7z) is available")
         except FileNotFoundError:
             raise RuntimeError("7z command not found. Ensure p7zip-full is installed.")
+        
+        # Detect fast-lzma2 codec support (same 7z format, faster encoder)
+        self._has_flzma2 = "FLZMA2" in result.stdout
+        if self._has_flzma2:
+            print("✓ fast-lzma2 (FLZMA2) codec is available")
+        
+        # Large pages help the LZ match finder when transparent hugepages are always on
+        try:
+            thp = Path("/sys/kernel/mm/transparent_hugepage/enabled").read_text()
+            self._large_pages = "[always]" in thp
+        except OSError:
+            self._large_pages = False
+        
+        # CPU count is fixed for the container's lifetime
+        self._cpu_count = os.cpu_count() or 2
+        
+        # Usable memory bounds the dictionary size we can safely request
+        self._mem_limit = _read_memory_limit()
 
     def predict(
         self,
@@ -27,9 +160,9 @@ class Predictor(BasePredictor):
             le=9,
         ),
         compression_method: str = Input(
-            description="Compression method (LZMA2 for 7z, Deflate for zip recommended)",
+            description="Compression method (LZMA2 for 7z, Deflate for zip recommended, zstd/lz4 for fast tar)",
             default="LZMA2",
-            choices=["LZMA", "LZMA2", "PPMd", "BZip2", "Deflate", "Copy"],
+            choices=["LZMA", "LZMA2", "PPMd", "BZip2", "Deflate", "Copy", "zstd", "lz4"],
         ),
         archive_format: str = Input(
             description="Archive format (7z recommended for best compression)",
@@ -41,13 +174,26 @@ class Predictor(BasePredictor):
             default="",
         ),
         solid_archive: bool = Input(
-            description="Create solid archive (better compression, slower)",
+            description=(
+                "Create solid archive (better compression, slower). "
+                "Automatically disabled for 7z archives of more than 8 files under 256 MB in total, "
+                "so files can be compressed in parallel"
+            ),
             default=True,
         ),
         volume_size: str = Input(
             description="Split archive into volumes (e.g., '100m', '1g', leave empty for single file)",
             default="",
         ),
+        threads: int = Input(
+            description="Number of compression threads (0=auto, use all available CPU cores)",
+            default=0,
+            ge=0,
+        ),
+        verbose: bool = Input(
+            description="Show detailed 7z progress output (slower on large jobs)",
+            default=False,
+        ),
     ) -> CogPath:
         """Compress files using p7zip with customizable options"""
         
@@ -56,11 +202,10 @@ class Predictor(BasePredictor):
         print("="*60)
         
         # Create output directory in /tmp (not auto-cleaned)
-        import uuid
         output_dir = Path(f"/tmp/p7zip_output_{uuid.uuid4().hex[:8]}")
         output_dir.mkdir(exist_ok=True)
         
-        # Copy input files to temp directory
+        # Collect input files (7z reads them in place, no staging copy)
         print(f"\n📥 Processing {len(input_files)} input file(s)...")
         file_list = []
         total_size = 0
@@ -69,144 +214,238 @@ class Predictor(BasePredictor):
         if archive_format == "zip" and compression_method == "LZMA2":
             print("⚠️  Warning: ZIP doesn't support LZMA2, using LZMA instead")
             compression_method = "LZMA"
+        if compression_method in TAR_CODECS and archive_format != "tar":
+            fallback = "LZMA2" if archive_format == "7z" else "Deflate"
+            print(f"⚠️  Warning: {compression_method} requires tar format, using {fallback} instead")
+            compression_method = fallback
         
-        for idx, input_file in enumerate(input_files, 1):
-            src_path = Path(str(input_file))
-            
-            # Verify file exists
-            if not src_path.exists():
-                raise RuntimeError(f"Input file does not exist: {src_path}")
-            
-            file_size = src_path.stat().st_size
+        tar_codec = compression_method if compression_method in TAR_CODECS else None
+        if tar_codec and password:
+            raise RuntimeError(f"Password protection is not supported with tar + {tar_codec}")
+        if tar_codec and volume_size:
+            print(f"⚠️  Warning: Volume splitting is not supported with tar + {tar_codec}, ignoring")
+            volume_size = ""
+        
+        # Stat inputs concurrently so per-file latency on network mounts overlaps,
+        # starting readahead on each file's head within a quarter of usable memory
+        src_paths = [Path(str(input_file)) for input_file in input_files]
+        readahead_budget = (self._mem_limit or 1024 * 1024 * 1024) // 4
+        readahead = min(READAHEAD_WINDOW, readahead_budget // max(1, len(src_paths)))
+        with ThreadPoolExecutor(max_workers=min(32, len(src_paths) or 1)) as pool:
+            file_sizes = list(pool.map(_stat_size, src_paths, repeat(readahead)))
+        
+        for idx, (src_path, file_size) in enumerate(zip(src_paths, file_sizes), 1):
             total_size += file_size
             
-            print(f"  [{idx}] {src_path.name} ({self._format_size(file_size)})")
+            print(f"  [{idx}] {src_path.name} ({_format_size(file_size)})")
             file_list.append(str(src_path.absolute()))
         
-        print(f"\n📊 Total input size: {self._format_size(total_size)}")
+        print(f"\n📊 Total input size: {_format_size(total_size)}")
+        
+        # Many small files compress faster as independent (non-solid) blocks,
+        # since a single solid stream cannot be split across threads
+        if (
+            archive_format == "7z"
+            and solid_archive
+            and len(input_files) > 8
+            and total_size < 256 * 1024 * 1024
+        ):
+            print("⚠️  Many small files detected, disabling solid archive for parallel compression")
+            solid_archive = False
         
         # Determine output filename
         output_name = f"compressed.{archive_format}"
-        if volume_size:
+        if tar_codec:
+            output_name = f"compressed.tar.{TAR_CODECS[tar_codec]}"
+        elif volume_size:
             output_name = f"compressed.{archive_format}.001"
         
         output_path = output_dir / output_name
         
-        # Build 7z command
-        cmd = ["7z", "a"]  # 'a' = add to archive
+        list_file = None
+        if tar_codec:
+            # Stream tar straight into the external codec, bypassing 7z
+            level = max(1, compression_level)
+            print(f"\n⚙️  Compression level: {level} ({_get_level_name(level)})")
+            print(f"⚙️  Compression method: {tar_codec} (tar pipeline)")
+            
+            # Names are read verbatim from a NUL-separated list file, so none can be
+            # taken as a tar option; the transform stores bare file names like 7z does
+            list_file = output_dir / "input.lst"
+            list_file.write_bytes(b"\0".join(os.fsencode(f) for f in file_list) + b"\0")
+            tar_cmd = [
+                "tar", "-cf", "-",
+                "--absolute-names",
+                "--transform=s,^.*/,,S",
+                "--null",
+                "--verbatim-files-from",
+                "-T", str(list_file),
+            ]
+            
+            if tar_codec == "zstd":
+                # -T0 = use all available cores
+                cmd = ["zstd", f"-T{threads}", f"-{level}", "-f", "-o", str(output_path)]
+                print(f"⚙️  Threads: {threads or 'auto'}")
+            else:
+                cmd = ["lz4", f"-{level}", "-f", "-", str(output_path)]
+            if verbose:
+                # Progress goes to stderr, which is streamed through the drainer
+                cmd[1:1] = ["-v", "--progress"] if tar_codec == "zstd" else ["-v"]
+            else:
+                cmd.insert(1, "-q")
+        else:
+            # Build 7z command
+            cmd = ["7z", "a"]  # 'a' = add to archive
+            n_threads = threads or self._cpu_count
         
-        # Archive format
-        cmd.extend([f"-t{archive_format}"])
+            # Archive format
+            cmd.extend([f"-t{archive_format}"])
         
-        # Compression level
-        cmd.extend([f"-mx={compression_level}"])
-        print(f"\n⚙️  Compression level: {compression_level} ({self._get_level_name(compression_level)})")
+            # Compression level
+            cmd.extend([f"-mx={compression_level}"])
+            print(f"\n⚙️  Compression level: {compression_level} ({_get_level_name(compression_level)})")
         
-        # Compression method (only for 7z format)
-        if archive_format == "7z":
-            cmd.extend([f"-m0={compression_method}"])
-            print(f"⚙️  Compression method: {compression_method}")
+            # Compression method (only for 7z format)
+            if archive_format == "7z":
+                if compression_method == "LZMA2" and self._has_flzma2:
+                    cmd.extend(["-m0=FLZMA2"])
+                    print(f"⚙️  Compression method: {compression_method} (fast-lzma2)")
+                else:
+                    cmd.extend([f"-m0={compression_method}"])
+                    print(f"⚙️  Compression method: {compression_method}")
             
-            # Solid archive (only for 7z)
-            if solid_archive:
-                cmd.extend(["-ms=on"])
-                print(f"⚙️  Solid archive: enabled")
+                if compression_method in {"LZMA", "LZMA2"} and compression_level > 0:
+                    # Dictionary size scaled to input size, only ever raised above the
+                    # level's default so fast levels keep their speed profile
+                    if compression_level >= 5 and self._mem_limit:
+                        if compression_method == "LZMA2":
+                            # LZMA2 splits input into ~4x dict blocks, one per 2-thread coder;
+                            # keep at least one block per coder so -mmt is not wasted
+                            coders = max(1, n_threads // 2)
+                            dict_size = total_size // (4 * coders)
+                        else:
+                            coders = 1
+                            dict_size = total_size // 2
+                        # Each coder needs ~11x dict; leave half of memory for everything else
+                        dict_size = min(dict_size, self._mem_limit // (22 * coders), 1 << 30)
+                        dict_mb = dict_size >> 20
+                        if dict_mb << 20 > _lzma_default_dict(compression_level):
+                            cmd.extend([f"-md={dict_mb}m"])
+                            print(f"⚙️  Dictionary size: {dict_mb} MB")
+                    if self._large_pages:
+                        cmd.extend(["-slp"])
+                        print(f"⚙️  Large pages: enabled")
+            
+                # Solid archive (only for 7z)
+                if solid_archive:
+                    cmd.extend(["-ms=on"])
+                    print(f"⚙️  Solid archive: enabled")
+                else:
+                    cmd.extend(["-ms=off"])
+            elif archive_format == "zip":
+                # ZIP uses different method syntax
+                cmd += ZIP_METHOD_ARGS.get(compression_method, ZIP_METHOD_ARGS["Deflate"])
+                print(f"⚙️  Compression method: {compression_method}")
             else:
-                cmd.extend(["-ms=off"])
-        elif archive_format == "zip":
-            # ZIP uses different method syntax
-            zip_methods = {
-                "LZMA": "-mm=LZMA",
-                "LZMA2": "-mm=LZMA",  # ZIP doesn't support LZMA2, use LZMA
-                "PPMd": "-mm=PPMd",
-                "BZip2": "-mm=BZip2",
-                "Deflate": "-mm=Deflate",
-                "Copy": "-mm=Copy"
-            }
-            cmd.extend([zip_methods.get(compression_method, "-mm=Deflate")])
-            print(f"⚙️  Compression method: {compression_method}")
-        else:
-            # TAR doesn't have compression methods in 7z
-            print(f"⚙️  Archive format: tar (compression via level only)")
+                # TAR doesn't have compression methods in 7z
+                print(f"⚙️  Archive format: tar (compression via level only)")
         
-        # Password encryption
-        if password:
-            cmd.extend([f"-p{password}"])
-            if archive_format == "7z":
-                cmd.extend(["-mhe=on"])  # Encrypt headers
-            print(f"🔒 Password protection: enabled")
+            # Multithreading (LZMA is capped at 2 threads, so leave it on defaults)
+            if (archive_format == "7z" and compression_method in {"LZMA2", "BZip2"}) or archive_format == "zip":
+                cmd.extend([f"-mmt={n_threads}"])
+                print(f"⚙️  Threads: {n_threads}")
         
-        # Volume splitting
-        if volume_size:
-            cmd.extend([f"-v{volume_size}"])
-            print(f"📦 Volume size: {volume_size}")
+            # Password encryption
+            if password:
+                cmd.extend([f"-p{password}"])
+                if archive_format == "7z":
+                    cmd.extend(["-mhe=on"])  # Encrypt headers
+                print(f"🔒 Password protection: enabled")
+        
+            # Volume splitting
+            if volume_size:
+                cmd.extend([f"-v{volume_size}"])
+                print(f"📦 Volume size: {volume_size}")
         
-        # Progress and other options
-        cmd.extend([
-            "-bsp1",  # Show progress
-            "-bt",    # Show execution time
-        ])
+            # Progress and other options
+            cmd += VERBOSE_OUTPUT_ARGS if verbose else QUIET_OUTPUT_ARGS
         
-        # Output file
-        cmd.append(str(output_path))
+            # Output file
+            cmd.append(str(output_path))
         
-        # Input files
-        cmd.extend(file_list)
+            # Input files (large lists go through a list file to stay under ARG_MAX)
+            if len(file_list) > 64 or sum(len(f) for f in file_list) > 32 * 1024:
+                list_file = output_dir / "input.lst"
+                list_file.write_text("\n".join(file_list) + "\n", encoding="utf-8")
+                cmd.extend(["-scsUTF-8", f"@{list_file}"])
+            else:
+                cmd.extend(file_list)
         
         print(f"\n🚀 Starting compression...")
         print(f"📦 Output format: {archive_format.upper()}")
-        if len(cmd) < 20:  # Only show full command if reasonable length
+        if tar_codec:
+            print(f"Command: {' '.join(tar_cmd)} | {' '.join(cmd)}")
+        elif len(cmd) < 20:  # Only show full command if reasonable length
             print(f"Command: {' '.join(cmd)}")
         else:
             print(f"Command: {' '.join(cmd[:10])}... [+{len(file_list)} files]")
         print("-" * 60)
         
         # Run compression with real-time output
+        tar_process = None
+        if tar_codec:
+            tar_process = subprocess.Popen(
+                tar_cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+            )
         process = subprocess.Popen(
             cmd,
+            stdin=tar_process.stdout if tar_process else subprocess.DEVNULL,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
+            # Codecs write to output_path and report on stderr, so stream that
+            stderr=subprocess.STDOUT if tar_codec else subprocess.PIPE,
+            bufsize=0,
         )
         
-        # Stream output
-        stdout_lines = []
-        stderr_lines = []
-        
-        # Read stdout
-        if process.stdout:
-            for line in process.stdout:
-                line = line.rstrip()
-                stdout_lines.append(line)
-                if line:
-                    # Parse progress if available
-                    if "%" in line:
-                        print(f"⏳ {line}")
-                    elif any(x in line for x in ["Everything", "OK", "Compressing", "Adding", "files,"]):
-                        print(f"✓ {line}")
-                    elif "ERROR" in line or "Error" in line:
-                        print(f"❌ {line}")
-                    else:
-                        print(f"  {line}")
+        # Stream output from a background thread so 7z never blocks on a full pipe
+        drainer = threading.Thread(
+            target=self._drain_output,
+            args=(process.stdout,),
+            daemon=True,
+        )
+        drainer.start()
+        if tar_process:
+            # Let tar receive SIGPIPE if the codec exits early
+            tar_process.stdout.close()
         
         # Wait for process to complete
-        stderr_output = process.stderr.read() if process.stderr else ""
+        stderr_output = process.stderr.read().decode(errors="replace") if process.stderr else ""
         process.wait()
+        drainer.join()
+        returncode = process.returncode
+        # Report the codec's failure first, tar then usually just dies of SIGPIPE
+        if tar_process and tar_process.wait() != 0 and returncode == 0:
+            returncode = tar_process.returncode
+        if list_file:
+            list_file.unlink(missing_ok=True)
         
         # Check for errors
-        if process.returncode != 0:
+        if returncode != 0:
             print("\n" + "="*60)
             print("❌ COMPRESSION FAILED")
             print("="*60)
-            print(f"\nExit code: {process.returncode}")
+            print(f"\nExit code: {returncode}")
             
             if stderr_output:
                 print(f"\nError output:")
                 print(stderr_output)
             
-            print("\n7z command that was attempted:")
-            print(" ".join(cmd))
+            print("\nCommand that was attempted:")
+            if tar_codec:
+                print(" ".join(tar_cmd) + " | " + " ".join(cmd))
+            else:
+                print(" ".join(cmd))
             
             print("\nFile paths being compressed:")
             for f in file_list[:5]:  # Show first 5
@@ -215,30 +454,41 @@ class Predictor(BasePredictor):
                 print(f"  ... and {len(file_list) - 5} more")
             
             raise RuntimeError(
-                f"Compression failed with exit code {process.returncode}. "
+                f"Compression failed with exit code {returncode}. "
                 f"Check the output above for details."
             )
         
         print("-" * 60)
         print("✅ Compression completed successfully!")
         
+        # Inputs are read once, release their cached pages without delaying the response
+        if HAS_FADVISE:
+            threading.Thread(target=_drop_cache, args=(file_list,), daemon=True).start()
+        
         # Check output file(s)
         if volume_size:
-            # Find all volume files
-            volume_files = sorted(output_dir.glob(f"compressed.{archive_format}.*"))
+            # Find all volume files (7z numbers them contiguously from .001)
+            volume_files = []
+            while True:
+                vol_name = f"compressed.{archive_format}.{len(volume_files) + 1:03d}"
+                try:
+                    vol_size = os.stat(output_dir / vol_name).st_size
+                except FileNotFoundError:
+                    break
+                volume_files.append((vol_name, vol_size))
             if not volume_files:
                 raise RuntimeError(
                     f"No output volumes found in {output_dir}\n"
                     f"Expected pattern: compressed.{archive_format}.*"
                 )
             
-            total_compressed = sum(f.stat().st_size for f in volume_files)
+            total_compressed = sum(vol_size for _, vol_size in volume_files)
             print(f"\n📦 Created {len(volume_files)} volume(s)")
-            for vol in volume_files:
-                print(f"  • {vol.name} ({self._format_size(vol.stat().st_size)})")
+            for vol_name, vol_size in volume_files:
+                print(f"  • {vol_name} ({_format_size(vol_size)})")
             
             # For volumes, return the first one (Cog limitation - single file output)
-            final_output = volume_files[0]
+            final_output = output_dir / volume_files[0][0]
             print(f"\n⚠️  Returning first volume: {final_output.name}")
             print(f"   Note: Download all volumes manually to extract")
         else:
@@ -255,33 +505,62 @@ class Predictor(BasePredictor):
         ratio = (1 - total_compressed / total_size) * 100 if total_size > 0 else 0
         
         print(f"\n📊 COMPRESSION STATISTICS")
-        print(f"  Original size:   {self._format_size(total_size)}")
-        print(f"  Compressed size: {self._format_size(total_compressed)}")
+        print(f"  Original size:   {_format_size(total_size)}")
+        print(f"  Compressed size: {_format_size(total_compressed)}")
         print(f"  Compression ratio: {ratio:.1f}% reduction")
-        print(f"  Space saved: {self._format_size(total_size - total_compressed)}")
+        print(f"  Space saved: {_format_size(total_size - total_compressed)}")
         
         print("\n" + "="*60)
         print("✨ Process complete!")
         print("="*60 + "\n")
         
+        # The archive must be a regular file: 7z/zip writers seek back to patch
+        # headers, and Cog uploads outputs by path, so a FIFO cannot be returned
         return CogPath(final_output)
     
-    def _format_size(self, size_bytes: int) -> str:
-        """Format bytes into human-readable size"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
+    def _drain_output(self, stream) -> None:
+        """Read 7z output in large binary chunks and print it line by line"""
+        pending = b""
+        last_progress = 0.0
+        suppressed = None
+        fd = stream.fileno()
+        while True:
+            chunk = os.read(fd, 65536)
+            if chunk:
+                *complete, pending = re.split(rb"[\r\n]", pending + chunk)
+            else:
+                complete, pending = [pending], b""
+            for raw in complete:
+                raw = raw.strip(b"\b").rstrip()
+                if not raw:
+                    continue
+                # Rate-limit progress updates to ~10 Hz, remembering the latest one
+                if b"%" in raw:
+                    now = time.monotonic()
+                    if now - last_progress < 0.1:
+                        suppressed = raw
+                        continue
+                    last_progress = now
+                elif suppressed:
+                    # Flush the last progress tick before regular output
+                    self._print_output_line(suppressed)
+                suppressed = None
+                self._print_output_line(raw)
+            if not chunk:
+                break
+        # Show the final progress tick (usually 100%) if it was held back
+        if suppressed:
+            self._print_output_line(suppressed)
     
-    def _get_level_name(self, level: int) -> str:
-        """Get compression level name"""
-        names = {
-            0: "Store (no compression)",
-            1: "Fastest",
-            3: "Fast",
-            5: "Normal",
-            7: "Maximum",
-            9: "Ultra"
-        }
-        return names.get(level, f"Level {level}")
\ No newline at end of file
+    def _print_output_line(self, raw: bytes) -> None:
+        """Print a single 7z output line (only lines actually printed get decoded)"""
+        line = raw.decode(errors="replace")
+        # Parse progress if available
+        if b"%" in raw:
+            print(f"⏳ {line}")
+        elif any(x in raw for x in [b"Everything", b"OK", b"Compressing", b"Adding", b"files,"]):
+            print(f"✓ {line}")
+        elif b"ERROR" in raw or b"Error" in raw:
+            print(f"❌ {line}")
+        else:
+            print(f"  {line}")